@@ -1,33 +1,179 @@
 # stedi_tool.py
 import streamlit as st
-import requests
-import re
+import asyncio
+import hashlib
+import httpx
+import io
+import orjson
+import time
 import pandas as pd
-from typing import Any
+from collections import deque
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception_type, retry_if_result, stop_after_attempt, stop_any, wait_exponential_jitter
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
 
 # --- Stedi API Logic ---
 
-def find_existing_provider(api_key: str, npi: str) -> str | None:
-    """Checks if a provider exists by searching for their NPI."""
+MAX_CONCURRENT_GETS: int = 10
+MAX_CONCURRENT_POSTS: int = 5
+HTTP_POOL_SIZE: int = 20
+LOOKUP_CACHE_TTL_SECONDS: float = 30.0
+LOOKUP_CACHE_MAXSIZE: int = 1024
+STEDI_FILTER_BATCH: int = 100
+HTTP_TIMEOUT_SECONDS: float = 30.0
+RETRY_ATTEMPTS: int = 5
+RETRY_MAX_WAIT_SECONDS: float = 10.0
+# Throttled calls wait as long as Retry-After asks up to this ceiling; beyond it they fail with the 429.
+RETRY_AFTER_MAX_SECONDS: float = 60.0
+# A failed POST (e.g. a 500 or a read timeout) may still have created the provider/enrollment, so POSTs are not
+# retried on 500 and every create attempt drops the cached lookup for what it tried to create.
+RETRY_STATUSES: dict[str, frozenset[int]] = {
+    "GET": frozenset({429, 500, 502, 503, 504}),
+    "POST": frozenset({429, 502, 503, 504}),
+}
+# Only errors raised before the request reached Stedi are safe to retry for a POST.
+RETRY_TRANSPORT_ERRORS: dict[str, tuple[type[Exception], ...]] = {
+    "GET": (httpx.TransportError,),
+    "POST": (httpx.ConnectError, httpx.ConnectTimeout),
+}
+
+def create_http_client(api_key: str) -> httpx.AsyncClient:
+    """Builds the HTTP/2 client shared by every API call in a batch, with auth headers set once.
+
+    Over HTTP/2 the calls are multiplexed on one connection; the pool limit only
+    matters if the server falls back to HTTP/1.1.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+        headers={"Authorization": api_key, "Content-Type": "application/json"},
+    )
+
+_exponential_backoff = wait_exponential_jitter(initial=0.5, max=RETRY_MAX_WAIT_SECONDS)
+
+def _retry_after(retry_state: RetryCallState) -> float | None:
+    """Returns the numeric Retry-After of the last response, if it sent one."""
+    outcome = retry_state.outcome
+    if outcome is not None and not outcome.failed:
+        retry_after: str = outcome.result().headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return None
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Honours a numeric Retry-After header on throttled responses, otherwise backs off exponentially with jitter."""
+    retry_after: float | None = _retry_after(retry_state)
+    if retry_after is not None:
+        return min(retry_after, RETRY_AFTER_MAX_SECONDS)
+    return _exponential_backoff(retry_state)
+
+def _stop_on_long_retry_after(retry_state: RetryCallState) -> bool:
+    """Stops retrying when the server asks to wait longer than RETRY_AFTER_MAX_SECONDS."""
+    retry_after: float | None = _retry_after(retry_state)
+    return retry_after is not None and retry_after > RETRY_AFTER_MAX_SECONDS
+
+async def _send(client: httpx.AsyncClient, method: str, endpoint_url: str, **kwargs: Any) -> httpx.Response:
+    """Sends a request, retrying transient failures. Returns the last response once retries run out."""
+    retry_statuses: frozenset[int] = RETRY_STATUSES[method]
+    retrying = AsyncRetrying(
+        stop=stop_any(stop_after_attempt(RETRY_ATTEMPTS), _stop_on_long_retry_after),
+        wait=_retry_wait,
+        retry=retry_if_exception_type(RETRY_TRANSPORT_ERRORS[method]) | retry_if_result(lambda response: response.status_code in retry_statuses),
+        retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+    )
+    return await retrying(client.request, method, endpoint_url, **kwargs)
+
+def _lookup_cache_key(client: httpx.AsyncClient, *parts: str) -> tuple[str, ...]:
+    """Scopes a lookup cache key to the client's API key without keeping the key itself."""
+    api_key_hash: str = hashlib.sha256(client.headers.get("Authorization", "").encode()).hexdigest()
+    return (api_key_hash, *parts)
+
+def _lookup_cache() -> dict[tuple[str, ...], tuple[float, Any]]:
+    """Returns the per-user lookup cache, which survives Streamlit reruns."""
+    return st.session_state.setdefault("stedi_lookup_cache", {})
+
+def _cache_get(key: tuple[str, ...]) -> tuple[bool, Any]:
+    """Returns (hit, value) for a cached lookup, dropping it once it is older than the TTL."""
+    entry: tuple[float, Any] | None = _lookup_cache().get(key)
+    if entry is None:
+        return False, None
+    if time.monotonic() - entry[0] > LOOKUP_CACHE_TTL_SECONDS:
+        _lookup_cache().pop(key, None)
+        return False, None
+    return True, entry[1]
+
+def _cache_set(key: tuple[str, ...], value: Any) -> None:
+    """Caches a lookup, pruning expired entries and then the oldest ones once the cache is full."""
+    cache: dict[tuple[str, ...], tuple[float, Any]] = _lookup_cache()
+    now: float = time.monotonic()
+    cache.pop(key, None)
+    if len(cache) >= LOOKUP_CACHE_MAXSIZE:
+        for stale_key in [k for k, (cached_at, _) in cache.items() if now - cached_at > LOOKUP_CACHE_TTL_SECONDS]:
+            del cache[stale_key]
+        while len(cache) >= LOOKUP_CACHE_MAXSIZE:
+            del cache[next(iter(cache))]
+    cache[key] = (now, value)
+
+def invalidate_provider_lookup(client: httpx.AsyncClient, npi: str) -> None:
+    """Forgets a cached provider lookup, e.g. after a create attempt."""
+    _lookup_cache().pop(_lookup_cache_key(client, "provider", npi), None)
+
+def invalidate_enrollment_lookup(client: httpx.AsyncClient, npi: str, payer_id: str) -> None:
+    """Forgets a cached enrollment lookup, e.g. after an enrollment attempt."""
+    _lookup_cache().pop(_lookup_cache_key(client, "enrollment", npi, payer_id), None)
+
+async def _post_json(client: httpx.AsyncClient, endpoint_url: str, payload: dict[str, Any]) -> dict[str, Any]:
+    """POSTs a JSON payload and wraps the outcome in a success/error dict."""
+    try:
+        response: httpx.Response = await _send(client, "POST", endpoint_url, content=orjson.dumps(payload))
+        if response.is_error:
+            error_message: str = response.text
+            try:
+                error_details: Any = orjson.loads(response.content)
+                if isinstance(error_details, dict):
+                    error_message = str(error_details.get('message', response.text))
+                elif isinstance(error_details, str):
+                    error_message = error_details
+            except ValueError:
+                pass
+            return {"success": False, "error": error_message}
+        data: Any = orjson.loads(response.content)
+        if not isinstance(data, dict):
+            return {"success": False, "error": f"Unexpected response from Stedi: {response.text}"}
+        return {"success": True, "data": data}
+    except (httpx.HTTPError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+
+async def find_existing_provider(client: httpx.AsyncClient, npi: str) -> str | None:
+    """Checks if a provider exists by searching for their NPI. Results are cached briefly.
+
+    Raises if the lookup fails, so the provider is reported instead of being created blindly.
+    """
     endpoint_url: str = "https://enrollments.us.stedi.com/2024-09-01/providers"
-    headers: dict[str, str] = {"Authorization": api_key}
     params: dict[str, str] = {"filter": npi}
+    cache_key: tuple[str, ...] = _lookup_cache_key(client, "provider", npi)
+    hit, cached_id = _cache_get(cache_key)
+    if hit:
+        return cached_id
     
-    try:
-        response = requests.get(endpoint_url, headers=headers, params=params)
-        response.raise_for_status()
-        data: dict[str, Any] = response.json()
-        
-        if data.get("items") and data["items"][0].get("npi") == npi:
-            return data["items"][0].get("id")
-        return None
-    except requests.exceptions.RequestException:
-        return None
-
-def create_stedi_provider(api_key: str, provider_details: dict[str, str], contact_details: dict[str, str]) -> dict[str, Any]:
+    response: httpx.Response = await _send(client, "GET", endpoint_url, params=params)
+    response.raise_for_status()
+    data: Any = orjson.loads(response.content)
+    items: Any = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError(f"Unexpected response from Stedi: {response.text}")
+
+    provider_id: str | None = None
+    if items and items[0].get("npi") == npi:
+        provider_id = items[0].get("id")
+    _cache_set(cache_key, provider_id)
+    return provider_id
+
+async def create_stedi_provider(client: httpx.AsyncClient, provider_details: dict[str, str], contact_details: dict[str, str]) -> dict[str, Any]:
     """Calls the Stedi API to create a new provider."""
     endpoint_url: str = "https://enrollments.us.stedi.com/2024-09-01/providers"
-    headers: dict[str, str] = {"Authorization": api_key, "Content-Type": "application/json"}
     payload: dict[str, Any] = {
         "name": provider_details["name"],
         "npi": provider_details["npi"],
@@ -37,39 +183,66 @@ def create_stedi_provider(api_key: str, provider_details: dict[str, str], contac
     }
     
     try:
-        response = requests.post(endpoint_url, headers=headers, json=payload)
-        response.raise_for_status()
-        return {"success": True, "data": response.json()}
-    except requests.exceptions.RequestException as e:
-        error_message: str = str(e)
-        if e.response is not None:
-            try:
-                error_details: dict[str, Any] = e.response.json()
-                error_message = error_details.get('message', e.response.text)
-            except ValueError:
-                error_message = e.response.text
-        return {"success": False, "error": error_message}
+        result: dict[str, Any] = await _post_json(client, endpoint_url, payload)
+    finally:
+        invalidate_provider_lookup(client, provider_details["npi"])
+    if result["success"]:
+        _cache_set(_lookup_cache_key(client, "provider", provider_details["npi"]), result["data"].get("id"))
+    return result
 
-def find_existing_enrollment(api_key: str, npi: str, payer_id: str) -> bool:
-    """Checks if an enrollment exists for a given NPI and Payer ID."""
+async def _fetch_enrolled_npis(client: httpx.AsyncClient, npis: list[str], payer_id: str) -> set[str]:
+    """Lists the enrollments for a chunk of NPIs at one payer, following pagination. Raises on failure."""
     endpoint_url: str = "https://enrollments.us.stedi.com/2024-09-01/enrollments"
-    headers: dict[str, str] = {"Authorization": api_key}
-    params: dict[str, str] = {"providerNpis": npi, "payerIds": payer_id}
+    params: dict[str, Any] = {"providerNpis": npis, "payerIds": payer_id, "pageSize": STEDI_FILTER_BATCH}
+    enrolled: set[str] = set()
 
-    try:
-        response = requests.get(endpoint_url, headers=headers, params=params)
+    while True:
+        response: httpx.Response = await _send(client, "GET", endpoint_url, params=params)
         response.raise_for_status()
-        data: dict[str, Any] = response.json()
-        return bool(data.get("items"))
-    except requests.exceptions.RequestException:
-        return False
+        data: Any = orjson.loads(response.content)
+        items: Any = data.get("items", []) if isinstance(data, dict) else None
+        if not isinstance(items, list) or not all(isinstance(item, dict) and isinstance(item.get("provider", {}), dict) for item in items):
+            raise ValueError(f"Unexpected response from Stedi: {response.text}")
+        enrolled.update(item.get("provider", {}).get("npi") for item in items)
+        if not (next_page_token := data.get("nextPageToken")):
+            return enrolled
+        params["pageToken"] = next_page_token
 
-def create_stedi_enrollment(api_key: str, provider_id: str, payer_id: str, user_email: str, contact_details: dict[str, str], transactions_to_enroll: list[str]) -> dict[str, Any]:
+async def find_existing_enrollments(client: httpx.AsyncClient, npis: list[str], payer_id: str, semaphore: asyncio.Semaphore) -> tuple[set[str], dict[str, Exception]]:
+    """Returns the NPIs that already have an enrollment with the payer, and the lookup error for each NPI that could not be checked.
+
+    Uncached NPIs are looked up STEDI_FILTER_BATCH at a time, each chunk holding a
+    slot of the given semaphore. Results are cached briefly.
+    """
+    enrolled: set[str] = set()
+    failed: dict[str, Exception] = {}
+    to_query: list[str] = []
+    for npi in dict.fromkeys(npis):
+        hit, cached_exists = _cache_get(_lookup_cache_key(client, "enrollment", npi, payer_id))
+        if not hit:
+            to_query.append(npi)
+        elif cached_exists:
+            enrolled.add(npi)
+
+    chunks: list[list[str]] = [to_query[i:i + STEDI_FILTER_BATCH] for i in range(0, len(to_query), STEDI_FILTER_BATCH)]
+    results: list[set[str] | BaseException] = await asyncio.gather(
+        *(_bounded(semaphore, _fetch_enrolled_npis(client, chunk, payer_id)) for chunk in chunks), return_exceptions=True,
+    )
+    for chunk, chunk_enrolled in zip(chunks, results):
+        if isinstance(chunk_enrolled, Exception):
+            failed.update(dict.fromkeys(chunk, chunk_enrolled))
+            continue
+        if isinstance(chunk_enrolled, BaseException):
+            raise chunk_enrolled
+        for npi in chunk:
+            _cache_set(_lookup_cache_key(client, "enrollment", npi, payer_id), npi in chunk_enrolled)
+        enrolled.update(chunk_enrolled.intersection(chunk))
+    return enrolled, failed
+
+async def create_stedi_enrollment(client: httpx.AsyncClient, provider_id: str, npi: str, payer_id: str, user_email: str, contact_details: dict[str, str], transactions_payload: dict[str, dict[str, bool]]) -> dict[str, Any]:
     """Calls the Stedi API to create an enrollment for a provider."""
     endpoint_url: str = "https://enrollments.us.stedi.com/2024-09-01/enrollments"
-    headers: dict[str, str] = {"Authorization": api_key, "Content-Type": "application/json"}
     
-    transactions_payload: dict[str, dict[str, bool]] = {key: {"enroll": True} for key in transactions_to_enroll}
     payload: dict[str, Any] = {
         "provider": {"id": provider_id},
         "payer": {"idOrAlias": payer_id},
@@ -81,18 +254,154 @@ def create_stedi_enrollment(api_key: str, provider_id: str, payer_id: str, user_
     }
     
     try:
-        response = requests.post(endpoint_url, headers=headers, json=payload)
-        response.raise_for_status()
-        return {"success": True, "data": response.json()}
-    except requests.exceptions.RequestException as e:
-        error_message: str = str(e)
-        if e.response is not None:
-            try:
-                error_details: dict[str, Any] = e.response.json()
-                error_message = error_details.get('message', e.response.text)
-            except ValueError:
-                error_message = e.response.text
-        return {"success": False, "error": error_message}
+        return await _post_json(client, endpoint_url, payload)
+    finally:
+        invalidate_enrollment_lookup(client, npi, payer_id)
+
+# --- Provider List Parsing ---
+
+PROVIDER_SEPARATOR: str = r'[;,]'
+PROVIDER_COLUMNS: list[str] = ['name', 'npi', 'taxId']
+
+def parse_provider_list(provider_data: str, tax_id_type: str) -> tuple[pd.DataFrame, int]:
+    """Parses "Name, NPI, Tax ID" lines (comma or semicolon separated) into a DataFrame.
+
+    Lines with a missing or empty field, or with more than three fields, are
+    dropped. Returns the DataFrame and the number of dropped lines.
+    """
+    try:
+        # The 'extra' column flags lines with more than three fields so they are dropped rather than truncated; a
+        # callable usecols keeps pandas from warning about fields beyond it.
+        df: pd.DataFrame = pd.read_csv(
+            io.StringIO(provider_data), sep=PROVIDER_SEPARATOR, engine='python', names=PROVIDER_COLUMNS + ['extra'],
+            usecols=lambda column: True, header=None, dtype=str, keep_default_na=False, skip_blank_lines=True,
+        )
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=PROVIDER_COLUMNS + ['taxIdType']), 0
+    for column in PROVIDER_COLUMNS:
+        df[column] = df[column].str.strip()
+    valid = df['extra'].isna() & df[PROVIDER_COLUMNS].notna().all(axis=1) & df[PROVIDER_COLUMNS].ne('').all(axis=1)
+    df = df.loc[valid, PROVIDER_COLUMNS].reset_index(drop=True)
+    df['taxIdType'] = tax_id_type
+    return df, int((~valid).sum())
+
+# --- Batch Processing ---
+
+PIPELINE_STAGES: int = 3
+STATUS_LOG_LINES: int = 50
+
+async def _bounded(semaphore: asyncio.Semaphore, coro: Awaitable[T]) -> T:
+    """Awaits a coroutine while holding a slot of the given semaphore."""
+    async with semaphore:
+        return await coro
+
+async def _capture(coro: Awaitable[T]) -> T | Exception:
+    """Awaits a coroutine, returning any exception it raises instead of propagating it."""
+    try:
+        return await coro
+    except Exception as e:
+        return e
+
+def _error_text(error: Exception) -> str:
+    """Describes an exception for the status log, falling back to its type when it has no message."""
+    return str(error) or type(error).__name__
+
+async def _run_stage(coros: list[Awaitable[T]], progress_bar: Any, stage: int, label: str) -> list[T | Exception]:
+    """Runs one pipeline stage concurrently in a TaskGroup, advancing the progress bar as calls complete.
+
+    An exception in one call is returned in its slot rather than cancelling the rest of the stage.
+    """
+    if not coros:
+        return []
+    async with asyncio.TaskGroup() as tg:
+        tasks: list[asyncio.Task[T | Exception]] = [tg.create_task(_capture(coro)) for coro in coros]
+        for done, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+            await next_done
+            progress_bar.progress((stage + done / len(tasks)) / PIPELINE_STAGES, text=f"Step {stage + 1}/{PIPELINE_STAGES} - {label}: {done}/{len(tasks)}")
+    return [task.result() for task in tasks]
+
+async def run_batch(api_key: str, payer_id: str, user_email: str, contact_details: dict[str, str], transactions_payload: dict[str, dict[str, bool]], providers: list[dict[str, str]], progress_bar: Any, log_status: Callable[[str], None]) -> list[list[str]]:
+    """Onboards all providers as three concurrent stages.
+
+    Stage 1 looks up every NPI while listing the payer's existing enrollments in
+    batches, stage 2 creates the missing providers, and stage 3 submits the
+    outstanding enrollments. Returns one [provider status, enrollment status,
+    details] row per provider, in input order.
+    """
+    get_limit = asyncio.Semaphore(MAX_CONCURRENT_GETS)
+    post_limit = asyncio.Semaphore(MAX_CONCURRENT_POSTS)
+    statuses: list[list[str]] = [["Error", "Skipped", "N/A"] for _ in providers]
+
+    async with create_http_client(api_key) as client:
+        async with asyncio.TaskGroup() as tg:
+            enrollment_lookup = tg.create_task(find_existing_enrollments(client, [p['npi'] for p in providers], payer_id, get_limit))
+            lookup_results: list[str | None | Exception] = await _run_stage(
+                [_bounded(get_limit, find_existing_provider(client, p['npi'])) for p in providers],
+                progress_bar, 0, "Looking up providers",
+            )
+        enrolled_npis, enrollment_lookup_errors = enrollment_lookup.result()
+        provider_ids: list[str | None] = [None] * len(providers)
+        missing: list[int] = []
+        for i, provider_id in enumerate(lookup_results):
+            if isinstance(provider_id, Exception):
+                error_msg: str = _error_text(provider_id)
+                log_status(f"❌ `{providers[i]['name']}`: Provider lookup failed: {error_msg}")
+                statuses[i][2] = error_msg
+            elif provider_id:
+                provider_ids[i] = provider_id
+                log_status(f"ℹ️ `{providers[i]['name']}`: Provider found. Using ID: {provider_id}")
+                statuses[i][0] = "Found"
+            else:
+                missing.append(i)
+
+        create_responses: list[dict[str, Any] | Exception] = await _run_stage(
+            [_bounded(post_limit, create_stedi_provider(client, providers[i], contact_details)) for i in missing],
+            progress_bar, 1, "Creating providers",
+        )
+        for i, create_response in zip(missing, create_responses):
+            if isinstance(create_response, Exception):
+                create_response = {"success": False, "error": _error_text(create_response)}
+            if create_response['success']:
+                provider_ids[i] = create_response['data'].get('id')
+                log_status(f"✅ `{providers[i]['name']}`: Provider created successfully! (ID: {provider_ids[i]})")
+                statuses[i][0] = "Created"
+            else:
+                error_msg = create_response['error']
+                log_status(f"❌ `{providers[i]['name']}`: Failed to create provider: {error_msg}")
+                statuses[i][2] = error_msg
+
+        to_enroll: list[int] = []
+        for i, provider_id in enumerate(provider_ids):
+            if not provider_id:
+                continue
+            if lookup_error := enrollment_lookup_errors.get(providers[i]['npi']):
+                error_msg = f"Could not check existing enrollments: {_error_text(lookup_error)}"
+                log_status(f"❌ `{providers[i]['name']}`: {error_msg}")
+                statuses[i][1:] = ["Error", error_msg]
+            elif providers[i]['npi'] in enrolled_npis:
+                log_status(f"⚠️ `{providers[i]['name']}`: Enrollment already exists. Skipped.")
+                statuses[i][1:] = ["Skipped (Exists)", "N/A"]
+            else:
+                to_enroll.append(i)
+
+        enroll_responses: list[dict[str, Any] | Exception] = await _run_stage(
+            [_bounded(post_limit, create_stedi_enrollment(client, provider_ids[i], providers[i]['npi'], payer_id, user_email, contact_details, transactions_payload)) for i in to_enroll],
+            progress_bar, 2, "Submitting enrollments",
+        )
+        for i, enroll_response in zip(to_enroll, enroll_responses):
+            if isinstance(enroll_response, Exception):
+                enroll_response = {"success": False, "error": _error_text(enroll_response)}
+            if enroll_response['success']:
+                enrollment_id: str = enroll_response['data'].get('id')
+                log_status(f"✅ `{providers[i]['name']}`: Enrollment submitted! (ID: {enrollment_id})")
+                statuses[i][1:] = ["Submitted", enrollment_id]
+            else:
+                error_msg = enroll_response['error']
+                log_status(f"❌ `{providers[i]['name']}`: Enrollment failed: {error_msg}")
+                statuses[i][1:] = ["Error", error_msg]
+
+    progress_bar.progress(1.0, text="Done")
+    return statuses
 
 # --- Streamlit User Interface ---
 
@@ -124,6 +433,7 @@ with col1:
         transaction_options[key] for key in transaction_options 
         if st.checkbox(key, value=True if key == "835 Claim Payments (ERAs)" else False)
     ]
+    transactions_payload: dict[str, dict[str, bool]] = {key: {"enroll": True} for key in selected_transactions}
 
 with col2:
     st.header("2. Default Contact")
@@ -148,65 +458,28 @@ if st.button("Start Onboarding Process", type="primary"):
     if not all([api_key, payer_id, user_email, provider_data_input]) or not all(contact_details.values()) or not selected_transactions:
         st.error("⚠️ Please fill in all fields and select at least one transaction type.")
     else:
-        lines: list[str] = provider_data_input.strip().split('\n')
-        providers_to_process: list[dict[str, str]] = [{'name': parts[0].strip(), 'npi': parts[1].strip(), 'taxId': parts[2].strip(), 'taxIdType': tax_id_type} for line in lines if line.strip() and len(parts := re.split(r'[;,]', line.strip(), 2)) == 3]
+        parsed_df, skipped_count = parse_provider_list(provider_data_input, tax_id_type)
+        if skipped_count:
+            st.warning(f"⚠️ Skipped {skipped_count} line(s) that are not exactly Name, NPI, Tax ID.")
+        providers_df: pd.DataFrame = parsed_df.drop_duplicates(subset='npi').reset_index(drop=True)
+        if duplicate_count := len(parsed_df) - len(providers_df):
+            st.warning(f"⚠️ Removed {duplicate_count} duplicate NPI(s); only the first line for each NPI is processed.")
+        providers_to_process: list[dict[str, str]] = providers_df.to_dict('records')
 
         if providers_to_process:
             st.info(f"Found {len(providers_to_process)} providers to process.")
             progress_bar = st.progress(0, text="Starting Process...")
-            status_log = st.container()
-            summary_data: list[list[str]] = []
-
-            for i, provider in enumerate(providers_to_process):
-                progress_bar.progress((i + 1) / len(providers_to_process), text=f"Processing {i+1}/{len(providers_to_process)}: {provider['name']}")
-                
-                with status_log:
-                    st.markdown(f"--- \n**Processing:** `{provider['name']}` (NPI: {provider['npi']})")
-                
-                provider_status: str
-                enrollment_status: str
-                details: str
-                
-                provider_id: str | None = find_existing_provider(api_key, provider['npi'])
-                if provider_id:
-                    with status_log:
-                        st.info(f"ℹ️ Provider found. Using ID: {provider_id}")
-                    provider_status = "Found"
-                else:
-                    create_response = create_stedi_provider(api_key, provider, contact_details)
-                    if create_response['success']:
-                        provider_id = create_response['data'].get('id')
-                        with status_log:
-                            st.success(f"✅ Provider created successfully! (ID: {provider_id})")
-                        provider_status = "Created"
-                    else:
-                        error_msg: str = create_response['error']
-                        with status_log:
-                            st.error(f"❌ Failed to create provider: {error_msg}")
-                        summary_data.append([provider['name'], provider['npi'], "Error", "Skipped", error_msg])
-                        continue
-
-                if provider_id:
-                    if find_existing_enrollment(api_key, provider['npi'], payer_id):
-                        with status_log:
-                            st.warning(f"⚠️ Enrollment already exists. Skipped.")
-                        enrollment_status, details = "Skipped (Exists)", "N/A"
-                    else:
-                        enroll_response = create_stedi_enrollment(api_key, provider_id, payer_id, user_email, contact_details, selected_transactions)
-                        if enroll_response['success']:
-                            enrollment_id: str = enroll_response['data'].get('id')
-                            with status_log:
-                                st.success(f"✅ Enrollment submitted! (ID: {enrollment_id})")
-                            enrollment_status, details = "Submitted", enrollment_id
-                        else:
-                            error_msg = enroll_response['error']
-                            with status_log:
-                                st.error(f"❌ Enrollment failed: {error_msg}")
-                            enrollment_status, details = "Error", error_msg
-                summary_data.append([provider['name'], provider['npi'], provider_status, enrollment_status, details])
+            log_placeholder = st.empty()
+            log_lines: deque[str] = deque(maxlen=STATUS_LOG_LINES)
+
+            def log_status(message: str) -> None:
+                log_lines.append(message)
+                log_placeholder.markdown("\n\n".join(log_lines))
+
+            statuses: list[list[str]] = asyncio.run(run_batch(api_key, payer_id, user_email, contact_details, transactions_payload, providers_to_process, progress_bar, log_status))
 
             st.header("🎉 Process Complete!")
             st.subheader("Summary Report")
-            summary_df: pd.DataFrame = pd.DataFrame(summary_data, columns=["Provider Name", "NPI", "Provider Status", "Enrollment Status", "Details/ID"])
+            summary_df: pd.DataFrame = providers_df[['name', 'npi']].rename(columns={'name': "Provider Name", 'npi': "NPI"})
+            summary_df[["Provider Status", "Enrollment Status", "Details/ID"]] = statuses
             st.dataframe(summary_df, use_container_width=True)
-